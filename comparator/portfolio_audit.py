@@ -1,60 +1,85 @@
 import numpy as np
-import pandas as pd
-from engine import metrics, monte_carlo
+from engine import metrics, monte_carlo, monte_carlo_numba, optimizer
 
-def run_audit(user_df, historical_data, risk_preference="High", risk_free_rate=0.02, num_simulations=400000):
+def run_audit(user_df, historical_data, risk_preference="High", risk_free_rate=0.02, num_simulations=400000, method="monte_carlo", seed=None, concentration=1.0, num_threads=None, metrics_fn=None):
     """
     Compares User vs. Optimal Portfolio.
+    `method` is "monte_carlo" (random portfolios) or "analytical" (long-only frontier solved directly).
+    `concentration` is the Dirichlet parameter used to sample simulated weights.
+    `metrics_fn(historical_data, tickers)` may supply cached (mean, cov, cholesky) for a
+    sorted ticker tuple; it is always handed the same `historical_data` passed here.
     """
     # 1. Filter for valid tickers
     user_tickers = user_df['Ticker'].tolist()
-    valid_tickers = [t for t in user_tickers if t in historical_data.columns]
+    valid_tickers = sorted({t for t in user_tickers if t in historical_data.columns})
     
     if len(valid_tickers) < 2:
         return None, "Not enough valid tickers found in history database. Need at least 2 matching stocks."
 
     # 2. Prepare Data
-    subset_data = historical_data[valid_tickers]
-    mean_ret, cov_mat = metrics.compute_annual_metrics(subset_data)
+    if metrics_fn is not None:
+        mean_ret, cov_mat, chol = metrics_fn(historical_data, tuple(valid_tickers))
+    else:
+        subset_data = historical_data[valid_tickers]
+        mean_ret, cov_mat = metrics.compute_annual_metrics(subset_data)
+        chol = monte_carlo.cholesky_factor(cov_mat)
     
     # 3. User Metrics Calculation
     # Align user weights to the valid subset
-    valid_user_df = user_df[user_df['Ticker'].isin(valid_tickers)].copy()
-    valid_user_df['Weight'] = valid_user_df['Weight'] / valid_user_df['Weight'].sum()
-    
-    # Create aligned weight array
-    user_weights = valid_user_df.set_index('Ticker')['Weight'].reindex(valid_tickers).fillna(0).values
+    # Create aligned weight array (dict lookup + gather, then renormalize);
+    # repeated tickers (e.g. two lots of the same stock) are summed
+    w_map = {}
+    for ticker, weight in zip(user_df['Ticker'].values, user_df['Weight'].values):
+        w_map[ticker] = w_map.get(ticker, 0.0) + weight
+    user_weights = np.fromiter((w_map.get(t, 0.0) for t in valid_tickers), dtype=np.float64, count=len(valid_tickers))
+    user_weights /= user_weights.sum()
     
     user_ret = np.dot(user_weights, mean_ret)
-    user_vol = np.sqrt(np.dot(user_weights.T, np.dot(cov_mat, user_weights)))
+    user_vol = np.linalg.norm(chol.T @ user_weights) # sqrt(w^T Σ w) with Σ = L L^T
     user_sharpe = (user_ret - risk_free_rate) / user_vol
 
-    # 4. Run Monte Carlo Simulation
-    sim_results = monte_carlo.run_monte_carlo(mean_ret, cov_mat, num_simulations, risk_free_rate)
+    # 4. Run Monte Carlo Simulation (or solve the frontier in closed form)
+    if method == "analytical":
+        sim_results = monte_carlo.run_analytical_frontier(mean_ret, cov_mat, risk_free_rate)
+    else:
+        # Uses the parallel Numba kernel when available, NumPy engine otherwise
+        sim_results = monte_carlo_numba.run_monte_carlo_numba(
+            mean_ret, cov_mat, num_simulations, risk_free_rate,
+            seed=seed, concentration=concentration, chol=chol, num_threads=num_threads
+        )
     
     # 5. Find Optimal Portfolio
     # High Risk = Max Sharpe (Aggressive)
     # Low Risk = Min Volatility (Conservative)
     if risk_preference == "High":
-        best_idx = np.argmax(sim_results['sharpe'])
+        best_idx, best_weights = sim_results['best_idx'], sim_results['best_weights']
     elif risk_preference == "Low":
-        best_idx = np.argmin(sim_results['volatility'])
+        best_idx, best_weights = sim_results['min_vol_idx'], sim_results['min_vol_weights']
     else: 
         # Medium: Find max sharpe but penalize extreme volatility (Simplified logic)
         # Or just default to Max Sharpe for now as per "Optimal" definition
-        best_idx = np.argmax(sim_results['sharpe'])
+        best_idx, best_weights = sim_results['best_idx'], sim_results['best_weights']
 
     opt_stats = {
         "return": sim_results['returns'][best_idx],
         "volatility": sim_results['volatility'][best_idx],
         "sharpe": sim_results['sharpe'][best_idx],
-        "weights": sim_results['weights'][best_idx]
+        "weights": best_weights
+    }
+
+    # 6. Keep only the ~2000 frontier points that get plotted (full arrays stay out of the session)
+    plot_idx = optimizer.sample_frontier(sim_results['volatility'], sim_results['returns'])
+    plot_data = {
+        "volatility": sim_results['volatility'][plot_idx],
+        "returns": sim_results['returns'][plot_idx],
+        "sharpe": sim_results['sharpe'][plot_idx]
     }
 
     return {
         "user": {"return": user_ret, "volatility": user_vol, "sharpe": user_sharpe, "weights": user_weights},
         "optimal": opt_stats,
         "tickers": valid_tickers,
+        "method": method,
         "num_simulations": len(sim_results['returns']),
-        "simulation_data": sim_results # Needed for graphs
+        "simulation_data": plot_data # Needed for graphs
     }, None
\ No newline at end of file
@@ -1,10 +1,20 @@
 import pandas as pd
 
+# pyarrow's multithreaded CSV reader is optional; fall back to the default C engine
+try:
+    import pyarrow  # noqa: F401
+    CSV_OPTIONS = {"engine": "pyarrow"}
+except ImportError:
+    CSV_OPTIONS = {}
+
 def load_returns(path):
-    df = pd.read_csv(path, index_col=0, parse_dates=True)
+    df = pd.read_csv(path, index_col=0, **CSV_OPTIONS)
+    # Parse dates ourselves: pyarrow yields date objects, the C engine strings.
+    # Either way the result is the same DatetimeIndex.
+    df.index = pd.to_datetime(df.index.astype(str))
 
     # Safety checks
-    assert not df.isnull().values.any(), "NaNs detected in returns data"
+    assert not df.isna().to_numpy(copy=False).any(), "NaNs detected in returns data"
     assert df.shape[1] >= 2, "Need at least 2 assets"
 
-    return df
\ No newline at end of file
+    return df
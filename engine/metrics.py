@@ -3,10 +3,15 @@ import numpy as np
 TRADING_DAYS = 252
 
 def compute_annual_metrics(daily_returns):
-    mean_daily = daily_returns.mean()
-    cov_daily = daily_returns.cov()
+    # Work on the raw matrix: skips pandas axis/NaN/alignment dispatch
+    returns = np.ascontiguousarray(daily_returns.to_numpy(dtype=np.float64))
+    mean_daily = returns.mean(axis=0)
+
+    # Sample covariance as one GEMM; symmetric by construction
+    centered = returns - mean_daily
+    cov_daily = (centered.T @ centered) / (returns.shape[0] - 1)
 
     annual_returns = mean_daily * TRADING_DAYS
     annual_cov = cov_daily * TRADING_DAYS
 
-    return annual_returns.values, annual_cov.values
\ No newline at end of file
+    return annual_returns, annual_cov
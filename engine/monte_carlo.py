@@ -1,29 +1,190 @@
+import warnings
 import numpy as np
+
+# Portfolios evaluated per batch; keeps the (CHUNK, K) weight block cache-resident
+CHUNK_SIZE = 65536
+
+def cholesky_factor(cov_matrix):
+    """
+    Lower-triangular L with cov_matrix = L @ L.T, so that w^T Σ w = ||w @ L||^2.
+    Adds a tiny diagonal jitter if the matrix is only semi-definite.
+    """
+    try:
+        return np.linalg.cholesky(cov_matrix)
+    except np.linalg.LinAlgError:
+        jitter = 1e-12 * np.trace(cov_matrix) / len(cov_matrix)
+        return np.linalg.cholesky(cov_matrix + jitter * np.eye(len(cov_matrix)))
+
 # Monte Carlo Simulation Function
-def run_monte_carlo(expected_returns, cov_matrix, num_portfolios, risk_free_rate):
+def run_monte_carlo(expected_returns, cov_matrix, num_portfolios, risk_free_rate, seed=None, concentration=1.0, chol=None):
     num_assets = len(expected_returns)
+    rng = np.random.default_rng(seed)
+    # Dirichlet(1) is uniform on the simplex; <1 favours corner allocations, >1 diversified ones
+    alpha = np.full(num_assets, concentration, dtype=np.float64)
+    # Σ is symmetric PSD: factor once, then each variance is a squared norm
+    if chol is None:
+        chol = cholesky_factor(cov_matrix)
+
+    # Only the 1-D metrics are kept for every portfolio (needed for the frontier)
+    portfolio_returns = np.empty(num_portfolios)
+    portfolio_volatility = np.empty(num_portfolios)
+    sharpe_ratios = np.empty(num_portfolios)
+
+    # Winning portfolios are tracked online instead of storing every weight row
+    # (kept as float32: weights are only displayed, metrics stay float64).
+    best_idx, best_weights = 0, None
+    min_vol_idx, min_vol_weights = 0, None
+
+    for start in range(0, num_portfolios, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, num_portfolios)
+
+        weights = rng.dirichlet(alpha, size=stop - start)
 
-    results = {
-        "returns": [],
-        "volatility": [],
-        "sharpe": [],
-        "weights": []
+        rets = portfolio_returns[start:stop]
+        vols = portfolio_volatility[start:stop]
+        sharpe = sharpe_ratios[start:stop]
+
+        np.matmul(weights, expected_returns, out=rets)
+        # w^T Σ w = ||w L||^2 for every row, driven by a single GEMM
+        projected = weights @ chol
+        np.sqrt(np.einsum('ij,ij->i', projected, projected), out=vols)
+        # Excess return then divide, both in place: no temporary N-length array
+        np.subtract(rets, risk_free_rate, out=sharpe)
+        sharpe /= vols
+
+        i = int(sharpe.argmax())
+        if best_weights is None or sharpe[i] > sharpe_ratios[best_idx]:
+            best_idx, best_weights = start + i, weights[i].astype(np.float32)
+
+        i = int(vols.argmin())
+        if min_vol_weights is None or vols[i] < portfolio_volatility[min_vol_idx]:
+            min_vol_idx, min_vol_weights = start + i, weights[i].astype(np.float32)
+
+    return {
+        "returns": portfolio_returns,
+        "volatility": portfolio_volatility,
+        "sharpe": sharpe_ratios,
+        "best_idx": best_idx,
+        "best_weights": best_weights,
+        "min_vol_idx": min_vol_idx,
+        "min_vol_weights": min_vol_weights
     }
 
-    for _ in range(num_portfolios):
-        weights = np.random.random(num_assets)
-        weights /= np.sum(weights)
 
-        portfolio_return = np.dot(weights, expected_returns)
-        portfolio_volatility = np.sqrt(
-            np.dot(weights.T, np.dot(cov_matrix, weights))
+def _long_only_min_variance(cov_matrix, eq_lhs, eq_rhs, start):
+    """
+    Primal active-set solve of min w^T Σ w  s.t.  eq_lhs @ w = eq_rhs, w >= 0,
+    from a feasible `start`. K is small, so each step is a tiny KKT solve.
+    """
+    num_assets = len(start)
+    num_eq = len(eq_rhs)
+    weights = start.astype(np.float64)
+    pinned = weights <= 0.0 # assets held at zero (active bounds)
+
+    for _ in range(50 * num_assets):
+        free = ~pinned
+        nf = int(free.sum())
+
+        # KKT system on the free assets: [Σ_FF  -E_F^T; E_F  0] [w_F; ν] = [0; e]
+        kkt = np.zeros((nf + num_eq, nf + num_eq))
+        kkt[:nf, :nf] = cov_matrix[np.ix_(free, free)]
+        kkt[:nf, nf:] = -eq_lhs[:, free].T
+        kkt[nf:, :nf] = eq_lhs[:, free]
+        sol = np.linalg.lstsq(kkt, np.concatenate([np.zeros(nf), eq_rhs]), rcond=None)[0]
+
+        target = np.zeros(num_assets)
+        target[free] = sol[:nf]
+        step = target - weights
+
+        # Walk towards the subproblem optimum until the first weight hits zero
+        blocking = free & (step < 0.0)
+        if blocking.any():
+            ratios = -weights[blocking] / step[blocking]
+            k = ratios.argmin()
+            if ratios[k] < 1.0:
+                j = np.flatnonzero(blocking)[k]
+                weights = weights + ratios[k] * step
+                weights[j] = 0.0
+                pinned[j] = True
+                continue
+
+        weights = target
+        # Release the pinned asset with the most negative multiplier, if any
+        multipliers = cov_matrix @ weights - eq_lhs.T @ sol[nf:]
+        multipliers[free] = np.inf
+        j = multipliers.argmin()
+        if multipliers[j] >= -1e-12:
+            break
+        pinned[j] = False
+    else:
+        warnings.warn("Long-only frontier solve did not converge; result may be suboptimal.", RuntimeWarning)
+
+    return np.maximum(weights, 0.0)
+
+
+# Analytical Efficient Frontier (long-only, solved directly)
+def run_analytical_frontier(expected_returns, cov_matrix, risk_free_rate, grid=200):
+    """
+    Long-only efficient frontier solved per target return (small QP on the simplex),
+    returned in the same dict shape as run_monte_carlo. Weights are >= 0 and sum to 1.
+    """
+    num_assets = len(expected_returns)
+    ones = np.ones(num_assets)
+    lo, hi = int(expected_returns.argmin()), int(expected_returns.argmax())
+
+    # Global minimum-variance portfolio anchors the efficient branch
+    min_vol_weights = _long_only_min_variance(cov_matrix, ones[None, :], np.array([1.0]), ones / num_assets)
+    min_vol_return = min_vol_weights @ expected_returns
+
+    frontier = [min_vol_weights]
+    # Identical expected returns: the frontier collapses to the min-variance portfolio
+    targets = np.linspace(min_vol_return, expected_returns[hi], grid)[1:-1] if expected_returns[hi] > expected_returns[lo] else []
+    for target in targets:
+        # Feasible start: mix of the lowest- and highest-return assets hitting the target
+        t = (target - expected_returns[lo]) / (expected_returns[hi] - expected_returns[lo])
+        start = np.zeros(num_assets)
+        start[lo], start[hi] = 1.0 - t, t
+        frontier.append(_long_only_min_variance(
+            cov_matrix, np.vstack([ones, expected_returns]), np.array([1.0, target]), start
+        ))
+
+    # Top end: only the highest-return asset(s) can hit max μ, so solve that face directly
+    # (the two-constraint KKT system is singular there)
+    if len(targets):
+        top = expected_returns == expected_returns[hi]
+        top_weights = np.zeros(num_assets)
+        top_weights[top] = _long_only_min_variance(
+            cov_matrix[np.ix_(top, top)], np.ones((1, int(top.sum()))), np.array([1.0]), np.full(int(top.sum()), 1.0 / top.sum())
         )
+        frontier.append(top_weights)
 
-        sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_volatility
+    # Max Sharpe (tangency): min y^T Σ y s.t. (μ - rf)·y = 1, y >= 0, then w = y / sum(y).
+    # Only defined when some asset beats the risk-free rate; it then lies on the efficient branch.
+    excess = expected_returns - risk_free_rate
+    if excess.max() > 0:
+        start = np.zeros(num_assets)
+        start[hi] = 1.0 / excess[hi]
+        tangency = _long_only_min_variance(cov_matrix, excess[None, :], np.array([1.0]), start)
+        tangency /= tangency.sum()
+        if tangency @ expected_returns >= min_vol_return:
+            frontier.append(tangency)
 
-        results["returns"].append(portfolio_return)
-        results["volatility"].append(portfolio_volatility)
-        results["sharpe"].append(sharpe_ratio)
-        results["weights"].append(weights.tolist())
+    frontier = np.array(frontier)
+    frontier = frontier[np.argsort(frontier @ expected_returns, kind='stable')]
 
-    return results
\ No newline at end of file
+    portfolio_returns = frontier @ expected_returns
+    portfolio_volatility = np.sqrt(np.einsum('ij,jk,ik->i', frontier, cov_matrix, frontier))
+    sharpe_ratios = (portfolio_returns - risk_free_rate) / portfolio_volatility
+
+    best_idx = int(sharpe_ratios.argmax())
+    min_vol_idx = int(portfolio_volatility.argmin())
+
+    return {
+        "returns": portfolio_returns,
+        "volatility": portfolio_volatility,
+        "sharpe": sharpe_ratios,
+        "best_idx": best_idx,
+        "best_weights": frontier[best_idx].astype(np.float32),
+        "min_vol_idx": min_vol_idx,
+        "min_vol_weights": frontier[min_vol_idx].astype(np.float32)
+    }
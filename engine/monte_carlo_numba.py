@@ -0,0 +1,129 @@
+import numpy as np
+from engine import monte_carlo
+
+# Numba is optional: without it we fall back to the vectorized NumPy engine
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def max_threads():
+    """
+    Number of threads the parallel kernel can use (1 when Numba is not installed).
+    """
+    return numba.config.NUMBA_NUM_THREADS if NUMBA_AVAILABLE else 1
+
+# Portfolios per parallel work item (fixed so results don't depend on thread count)
+BLOCK_SIZE = 8192
+
+if NUMBA_AVAILABLE:
+    # Restricted fastmath: FMA contraction and reassociation only. Full fastmath would
+    # assume no inf/nan, which breaks the +/-inf sentinels used to track winners below.
+    @njit(parallel=True, fastmath={'contract', 'arcp', 'reassoc'}, cache=True)
+    def _simulate(expected_returns, chol, risk_free_rate, concentration, block_bounds, block_seeds):
+        num_assets = expected_returns.shape[0]
+        num_blocks = block_seeds.shape[0]
+        num_portfolios = block_bounds[num_blocks]
+
+        portfolio_returns = np.empty(num_portfolios)
+        portfolio_volatility = np.empty(num_portfolios)
+        sharpe_ratios = np.empty(num_portfolios)
+
+        # Per-block winners, reduced to a single portfolio by the caller
+        best_idx = np.zeros(num_blocks, dtype=np.int64)
+        best_weights = np.zeros((num_blocks, num_assets))
+        min_vol_idx = np.zeros(num_blocks, dtype=np.int64)
+        min_vol_weights = np.zeros((num_blocks, num_assets))
+
+        for b in prange(num_blocks):
+            # Each block reseeds its thread-local generator -> reproducible streams
+            np.random.seed(block_seeds[b])
+            weights = np.empty(num_assets)
+            best_sharpe = -np.inf
+            lowest_vol = np.inf
+
+            for n in range(block_bounds[b], block_bounds[b + 1]):
+                # Dirichlet(concentration) draw via normalized Gamma variates
+                total = 0.0
+                for i in range(num_assets):
+                    weights[i] = np.random.gamma(concentration, 1.0)
+                    total += weights[i]
+
+                ret = 0.0
+                for i in range(num_assets):
+                    weights[i] /= total
+                    ret += weights[i] * expected_returns[i]
+
+                # w^T Σ w = ||w L||^2 with L lower-triangular: K(K+1)/2 FMAs
+                var = 0.0
+                for j in range(num_assets):
+                    proj = 0.0
+                    for i in range(j, num_assets):
+                        proj += weights[i] * chol[i, j]
+                    var += proj * proj
+
+                vol = np.sqrt(var)
+                sharpe = (ret - risk_free_rate) / vol
+
+                portfolio_returns[n] = ret
+                portfolio_volatility[n] = vol
+                sharpe_ratios[n] = sharpe
+
+                if sharpe > best_sharpe:
+                    best_sharpe = sharpe
+                    best_idx[b] = n
+                    best_weights[b, :] = weights
+                if vol < lowest_vol:
+                    lowest_vol = vol
+                    min_vol_idx[b] = n
+                    min_vol_weights[b, :] = weights
+
+        return (portfolio_returns, portfolio_volatility, sharpe_ratios,
+                best_idx, best_weights, min_vol_idx, min_vol_weights)
+
+
+def run_monte_carlo_numba(expected_returns, cov_matrix, num_portfolios, risk_free_rate, seed=None, concentration=1.0, chol=None, num_threads=None):
+    """
+    Parallel Numba version of run_monte_carlo. Returns the same dict.
+    Falls back to the NumPy engine when Numba is not installed or only one
+    thread is available (the BLAS-driven NumPy path is faster single-threaded).
+    """
+    if NUMBA_AVAILABLE and num_threads:
+        numba.set_num_threads(min(num_threads, max_threads()))
+
+    if not NUMBA_AVAILABLE or numba.get_num_threads() == 1:
+        return monte_carlo.run_monte_carlo(expected_returns, cov_matrix, num_portfolios, risk_free_rate,
+                                           seed=seed, concentration=concentration, chol=chol)
+
+    if chol is None:
+        chol = monte_carlo.cholesky_factor(cov_matrix)
+
+    block_bounds = np.append(np.arange(0, num_portfolios, BLOCK_SIZE), num_portfolios).astype(np.int64)
+    num_blocks = len(block_bounds) - 1
+    # Independent, reproducible stream per block (parallel-safe seeding)
+    block_seeds = np.array(
+        [child.generate_state(1)[0] for child in np.random.SeedSequence(seed).spawn(num_blocks)],
+        dtype=np.int64
+    )
+
+    (rets, vols, sharpe,
+     best_idx, best_weights, min_vol_idx, min_vol_weights) = _simulate(
+        np.ascontiguousarray(expected_returns, dtype=np.float64),
+        np.ascontiguousarray(chol, dtype=np.float64),
+        float(risk_free_rate), float(concentration), block_bounds, block_seeds
+    )
+
+    best_block = sharpe[best_idx].argmax()
+    min_vol_block = vols[min_vol_idx].argmin()
+
+    return {
+        "returns": rets,
+        "volatility": vols,
+        "sharpe": sharpe,
+        "best_idx": int(best_idx[best_block]),
+        "best_weights": best_weights[best_block].astype(np.float32),
+        "min_vol_idx": int(min_vol_idx[min_vol_block]),
+        "min_vol_weights": min_vol_weights[min_vol_block].astype(np.float32)
+    }
@@ -1,12 +1,54 @@
 import numpy as np
 
 def find_max_sharpe(results):
-    sharpe_ratios = np.array(results["sharpe"])
-    idx = sharpe_ratios.argmax()
+    idx = results["best_idx"]
 
     return {
         "expected_return": results["returns"][idx],
         "volatility": results["volatility"][idx],
         "sharpe_ratio": results["sharpe"][idx],
-        "weights": results["weights"][idx]
-    }
\ No newline at end of file
+        "weights": results["best_weights"]
+    }
+
+def sample_frontier(volatility, returns, n_points=2000, bins=50, seed=0):
+    """
+    Picks up to n_points indices for plotting, stratified over the volatility axis.
+    Each bin keeps its highest-return candidates so the frontier edge stays visible.
+    For large N, candidates are drawn with rng.integers instead of permuting all N indices.
+    """
+    n = len(volatility)
+    if n <= n_points:
+        return np.arange(n)
+
+    rng = np.random.default_rng(seed)
+    pool_size = 20 * n_points
+    # Small runs use every sample; large ones a de-duplicated random candidate pool
+    candidates = np.arange(n) if n <= pool_size else np.unique(rng.integers(n, size=pool_size))
+    cand_vol = volatility[candidates]
+    cand_ret = returns[candidates]
+
+    edges = np.linspace(cand_vol.min(), cand_vol.max(), bins + 1)
+    bin_ids = np.clip(np.searchsorted(edges, cand_vol, side='right') - 1, 0, bins - 1)
+    per_bin = n_points // bins
+    n_edge = max(per_bin // 4, 1)
+
+    picked = []
+    for b in range(bins):
+        members = np.flatnonzero(bin_ids == b)
+        if len(members) <= per_bin:
+            picked.append(members)
+            continue
+        # Top returns in the bin (frontier edge) + a random fill for the cloud
+        top = np.argpartition(cand_ret[members], -n_edge)[-n_edge:]
+        fill = rng.choice(np.delete(members, top), per_bin - n_edge, replace=False)
+        picked.append(members[top])
+        picked.append(fill)
+    picked = np.concatenate(picked)
+
+    # Sparse tail bins leave quota unused: top up from the dense middle
+    shortfall = n_points - len(picked)
+    if shortfall > 0:
+        remaining = np.setdiff1d(np.arange(len(candidates)), picked)
+        picked = np.concatenate([picked, rng.choice(remaining, min(shortfall, len(remaining)), replace=False)])
+
+    return candidates[picked]
@@ -1,5 +1,11 @@
+import re
+import numpy as np
 import pandas as pd
 
+# Header keywords for fuzzy column matching, compiled once at import
+TICKER_RE = re.compile(r'ticker|symbol|stock|asset')
+WEIGHT_RE = re.compile(r'weight|percent|%|value|amount')
+
 def parse_portfolio(file):
     """
     Parses an uploaded Excel/CSV file to extract Tickers and Weights.
@@ -17,22 +23,25 @@ def parse_portfolio(file):
     df.columns = [str(c).strip().lower() for c in df.columns]
 
     # Fuzzy Match Logic
-    ticker_col = next((c for c in df.columns if any(k in c for k in ['ticker', 'symbol', 'stock', 'asset'])), None)
-    weight_col = next((c for c in df.columns if any(k in c for k in ['weight', 'percent', '%', 'value', 'amount'])), None)
+    ticker_col = next((c for c in df.columns if TICKER_RE.search(c)), None)
+    weight_col = next((c for c in df.columns if WEIGHT_RE.search(c)), None)
 
     if not ticker_col or not weight_col:
         return None, "Could not find 'Ticker' or 'Weight' columns. Please check your file headers."
 
     # Data Cleaning
-    clean_df = pd.DataFrame()
-    clean_df['Ticker'] = df[ticker_col].astype(str).str.upper().str.strip()
-    
-    # Weight Handling (e.g. 20 vs 0.20)
-    raw_weights = pd.to_numeric(df[weight_col], errors='coerce').fillna(0)
-    if raw_weights.sum() > 1.5: 
-        raw_weights /= 100.0
-        
-    clean_df['Weight'] = raw_weights / raw_weights.sum() # Normalize to 1.0
-    clean_df = clean_df[clean_df['Weight'] > 0] # Remove zero rows
+    tickers = df[ticker_col].astype(str).str.upper().str.strip().to_numpy()
+
+    # Weight Handling (e.g. 20 vs 0.20), done in a single NumPy buffer
+    weights = pd.to_numeric(df[weight_col], errors='coerce').to_numpy(dtype=np.float64, copy=True)
+    np.nan_to_num(weights, copy=False)
+    if weights.sum() > 1.5: 
+        weights *= 0.01
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights /= weights.sum() # Normalize to 1.0
+    mask = weights > 0 # Remove zero rows
+
+    clean_df = pd.DataFrame({'Ticker': tickers[mask], 'Weight': weights[mask]})
     
     return clean_df, None
\ No newline at end of file
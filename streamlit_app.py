@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import numpy as np
 import os
 import inspect
 
@@ -11,6 +10,7 @@ import inspect
 try:
     from parser import excel_parser
     from comparator import portfolio_audit
+    from engine import data_loader, metrics, monte_carlo, monte_carlo_numba
 except ImportError:
     st.error("⚠️ Modules not found. Please ensure 'parser/' and 'comparator/' folders exist in the same directory.")
     st.stop()
@@ -22,12 +22,34 @@ st.set_page_config(page_title="Portfolio Risk Intelligence", layout="wide")
 DATA_PATH = "data/daily_returns.csv"
 
 # Configuration Maps
+METHOD_MAP = {
+    "Monte Carlo (visual)": "monte_carlo",
+    "Analytical (fast)": "analytical"
+}
+
 RISK_FREE_MAP = {
     "1–3 years": 0.015,
     "3–6 years": 0.02,
     "6+ years": 0.025
 }
 
+# --- CACHED DATA ---
+@st.cache_resource(show_spinner=False)
+def _load_history(path):
+    """
+    Parses the historical returns CSV once per process.
+    """
+    return data_loader.load_returns(path)
+
+@st.cache_data(show_spinner=False)
+def _metrics_for(returns_df, tickers: tuple):
+    """
+    Annual metrics and Cholesky factor for an asset set, reused across reruns.
+    Keyed on both the history frame and the tickers, so it can't go stale.
+    """
+    mean_ret, cov_mat = metrics.compute_annual_metrics(returns_df[list(tickers)])
+    return mean_ret, cov_mat, monte_carlo.cholesky_factor(cov_mat)
+
 # --- PLOTLY VISUALIZATION FUNCTIONS ---
 def plot_allocation_comparison(tickers, user_weights, optimal_weights):
     """
@@ -46,17 +68,13 @@ def plot_efficient_frontier(sim_data, user_metrics, opt_metrics):
     """
     Generates the Efficient Frontier scatter plot with User vs Optimal markers.
     """
-    # Downsample for speed (plot 2000 points instead of 30k)
-    # Ensure we don't try to sample more than we have
-    n_points = min(len(sim_data['returns']), 2000)
-    idx = np.random.choice(len(sim_data['returns']), n_points, replace=False)
-    
+    # sim_data is already downsampled to ~2000 points by run_audit
     fig = go.Figure()
 
-    # 1. The Cloud (All Possibilities)
-    fig.add_trace(go.Scatter(
-        x=np.array(sim_data['volatility'])[idx],
-        y=np.array(sim_data['returns'])[idx],
+    # 1. The Cloud (All Possibilities), rendered with WebGL
+    fig.add_trace(go.Scattergl(
+        x=sim_data['volatility'],
+        y=sim_data['returns'],
         mode='markers',
         marker=dict(color='lightgrey', size=3, opacity=0.5),
         name='Simulations'
@@ -111,18 +129,40 @@ def main():
             index=2
         )
         
+        method_label = st.radio(
+            "Frontier Method",
+            options=list(METHOD_MAP.keys()),
+            help="Analytical solves the long-only frontier directly instead of sampling random portfolios."
+        )
+        method = METHOD_MAP[method_label]
+
         # Dynamically get default from backend
         sig = inspect.signature(portfolio_audit.run_audit)
         backend_default = sig.parameters['num_simulations'].default
-        
-        num_sims = st.slider(
-            "Number of Simulations",
-            min_value=10000,
-            max_value=1000000,
-            value=int(backend_default),
-            step=10000,
-            help="Higher numbers increase accuracy but take longer to compute."
-        )
+        num_sims = int(backend_default)
+        num_threads = None
+
+        # Simulation controls only apply to the Monte Carlo engine
+        if method == "monte_carlo":
+            num_sims = st.slider(
+                "Number of Simulations",
+                min_value=10000,
+                max_value=1000000,
+                value=int(backend_default),
+                step=10000,
+                help="Higher numbers increase accuracy but take longer to compute."
+            )
+
+            # Thread control only applies to the Numba engine
+            max_threads = monte_carlo_numba.max_threads()
+            if max_threads > 1:
+                num_threads = st.slider(
+                    "CPU Threads",
+                    min_value=1,
+                    max_value=max_threads,
+                    value=max_threads,
+                    help="Number of threads used by the parallel simulation kernel."
+                )
         
         st.divider()
         
@@ -160,17 +200,21 @@ def main():
                 st.error(f"Data file not found at {DATA_PATH}")
                 st.stop()
                 
-            hist_data = pd.read_csv(DATA_PATH, index_col=0, parse_dates=True)
+            hist_data = _load_history(DATA_PATH)
             risk_free_rate = RISK_FREE_MAP[horizon]
 
-            with st.spinner(f"Running {num_sims:,} Monte Carlo Simulations..."):
+            spinner_text = "Solving Efficient Frontier..." if method == "analytical" else f"Running {num_sims:,} Monte Carlo Simulations..."
+            with st.spinner(spinner_text):
                 # CALL THE COMPARATOR
                 result, err = portfolio_audit.run_audit(
                     user_df, 
                     hist_data, 
                     risk_preference=risk_pref, 
                     risk_free_rate=risk_free_rate,
-                    num_simulations=num_sims
+                    num_simulations=num_sims,
+                    method=method,
+                    num_threads=num_threads,
+                    metrics_fn=_metrics_for
                 )
 
             if err:
@@ -225,10 +269,16 @@ def main():
                     st.plotly_chart(pie_fig, use_container_width=True)
                 
                 # --- POSTSCRIPT ---
-                st.markdown(f"""
-                ---
-                *Computed using **{result['num_simulations']:,}** simulations. The efficiency frontier visualization is downsampled to 2,000 points for performance.*
-                """)
+                if result['method'] == "analytical":
+                    st.markdown(f"""
+                    ---
+                    *Computed analytically over **{result['num_simulations']:,}** frontier points (long-only).*
+                    """)
+                else:
+                    st.markdown(f"""
+                    ---
+                    *Computed using **{result['num_simulations']:,}** simulations. The efficiency frontier visualization is downsampled to 2,000 points for performance.*
+                    """)
     
     elif input_method == "Upload File":
         st.info("👋 Please upload a portfolio file to begin.")